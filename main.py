@@ -1,22 +1,50 @@
 # main.py
 from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, func, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+import time
 import uvicorn
-from src.database.core import engine, get_db, Base
+from src.database.core import SessionLocal, config, get_db
 from src.entities.click import ClickModel  
 from src.entities.url import URLModel
-from src.schemas.models import URLCreate, URLResponse, URLStats, ClickResponse
+from src.schemas.models import URLCreate, URLResponse, URLStats
 from src.utils import generate_short_code, is_valid_url
+from src.click_buffer import click_buffer
+from src.cache import DELETED, create_redis, get_cached_url, cache_url, evict_url
+from src.bloom import short_codes, load_short_codes
+from src.responses import UTCJSONResponse
 
 
-Base.metadata.create_all(bind=engine)
+REDIRECT_MAX_AGE = 3600
+NOT_FOUND_MAX_AGE = 60
+NOT_FOUND_HEADERS = {"Cache-Control": f"public, max-age={NOT_FOUND_MAX_AGE}"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with SessionLocal() as db:
+        await load_short_codes(db)
+    
+    app.state.base_url = (config.get("PUBLIC_BASE_URL") or "").rstrip('/') or None
+    app.state.redis = create_redis()
+    click_buffer.start()
+    try:
+        yield
+    finally:
+        await click_buffer.stop()
+        await app.state.redis.aclose()
+
 
 app = FastAPI(
     title="URL Shortener API",
     description="Shorten URLs with analytics and custom aliases",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=UTCJSONResponse
 )
 
 
@@ -24,7 +52,7 @@ app = FastAPI(
 async def create_short_url(
     url_data: URLCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
    
     if not is_valid_url(url_data.original_url):
@@ -40,45 +68,57 @@ async def create_short_url(
             )
         
       
-        existing = db.query(URLModel).filter(URLModel.short_code == url_data.custom_alias).first()
-        if existing:
+        taken = await db.scalar(select(1).where(URLModel.short_code == url_data.custom_alias).limit(1))
+        if taken is not None:
             raise HTTPException(status_code=409, detail="Custom alias already exists")
         
-        short_code = url_data.custom_alias
+        candidates = [url_data.custom_alias]
     else:
        
         max_attempts = 10
-        for _ in range(max_attempts):
-            short_code = generate_short_code()
-            existing = db.query(URLModel).filter(URLModel.short_code == short_code).first()
-            if not existing:
-                break
-        else:
-            raise HTTPException(status_code=500, detail="Failed to generate unique short code")
+        candidates = [
+            code for code in (generate_short_code() for _ in range(max_attempts))
+            if code not in short_codes
+        ]
     
     
-    db_url = URLModel(
-        original_url=url_data.original_url,
-        short_code=short_code,
-        expires_at=url_data.expires_at
-    )
+    for short_code in candidates:
+        try:
+            row = (
+                await db.execute(
+                    insert(URLModel)
+                    .values(
+                        original_url=url_data.original_url,
+                        short_code=short_code,
+                        expires_at=url_data.expires_at
+                    )
+                    .returning(URLModel.id, URLModel.created_at, URLModel.click_count)
+                )
+            ).one()
+            await db.commit()
+            break
+        except IntegrityError:
+            await db.rollback()
+    else:
+        if url_data.custom_alias:
+            raise HTTPException(status_code=409, detail="Custom alias already exists")
+        raise HTTPException(status_code=500, detail="Failed to generate unique short code")
     
-    db.add(db_url)
-    db.commit()
-    db.refresh(db_url)
+    short_codes.add(short_code)
+    await cache_url(request.app.state.redis, short_code, row.id, url_data.original_url, url_data.expires_at)
     
     
-    base_url = str(request.base_url).rstrip('/')
+    base_url = request.app.state.base_url or str(request.base_url).rstrip('/')
     short_url = f"{base_url}/{short_code}"
     
     return URLResponse(
-        id=db_url.id,
-        original_url=db_url.original_url,
-        short_code=db_url.short_code,
+        id=row.id,
+        original_url=url_data.original_url,
+        short_code=short_code,
         short_url=short_url,
-        created_at=db_url.created_at,
-        expires_at=db_url.expires_at,
-        click_count=db_url.click_count
+        created_at=row.created_at,
+        expires_at=url_data.expires_at,
+        click_count=row.click_count
     )
 
 
@@ -86,117 +126,173 @@ async def create_short_url(
 async def redirect_to_url(
     short_code: str,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    url_entry = db.query(URLModel).filter(URLModel.short_code == short_code).first()
-    
-    if not url_entry:
-        raise HTTPException(status_code=404, detail="Short URL not found")
+    redis = request.app.state.redis
+    cached = await get_cached_url(redis, short_code)
     
+    if cached is DELETED:
+        raise HTTPException(status_code=404, detail="Short URL not found", headers=NOT_FOUND_HEADERS)
     
-    if url_entry.expires_at:
-        now = datetime.now(timezone.utc)
-        expires = url_entry.expires_at
-       
-        if expires.tzinfo is None:
-            expires = expires.replace(tzinfo=timezone.utc)
+    if cached is None:
+        row = (
+            await db.execute(
+                select(
+                    URLModel.id,
+                    URLModel.original_url,
+                    URLModel.expires_at,
+                    (URLModel.expires_at <= func.now()).label("expired")
+                )
+                .where(URLModel.short_code == short_code)
+            )
+        ).first()
         
-        if expires < now:
+        if row is None:
+            raise HTTPException(status_code=404, detail="Short URL not found", headers=NOT_FOUND_HEADERS)
+        
+        if row.expired:
+            raise HTTPException(status_code=410, detail="Short URL has expired")
+        
+        url_id, expires_ts, original_url = await cache_url(
+            redis, short_code, row.id, row.original_url, row.expires_at, only_if_absent=True
+        )
+    else:
+        url_id, expires_ts, original_url = cached
+        
+        if expires_ts is not None and expires_ts < time.time():
             raise HTTPException(status_code=410, detail="Short URL has expired")
     
     
-    click = ClickModel(
-        url_id=url_entry.id,
-        ip_address=request.client.host,
-        user_agent=request.headers.get("user-agent", "Unknown"),
-        referer=request.headers.get("referer")
-    )
-    
-    
-    url_entry.click_count += 1
-    url_entry.last_accessed = datetime.now(timezone.utc)
+    max_age = REDIRECT_MAX_AGE
+    if expires_ts is not None:
+        max_age = max(0, min(max_age, int(expires_ts - time.time())))
     
-    db.add(click)
-    db.commit()
+    await click_buffer.put({
+        "url_id": url_id,
+        "clicked_at": datetime.now(timezone.utc),
+        "ip_address": request.client.host,
+        "user_agent": request.headers.get("user-agent", "Unknown")[:512],
+        "referer": (request.headers.get("referer") or "")[:2048] or None
+    })
     
     
-    return RedirectResponse(url=url_entry.original_url, status_code=307)
+    return RedirectResponse(
+        url=original_url,
+        status_code=307,
+        headers={"Cache-Control": f"public, max-age={max_age}"}
+    )
 
 
 @app.get("/api/v1/urls/{short_code}/stats", response_model=URLStats)
-async def get_url_stats(short_code: str, db: Session = Depends(get_db)):
+async def get_url_stats(short_code: str, db: AsyncSession = Depends(get_db)):
    
     
-    url_entry = db.query(URLModel).filter(URLModel.short_code == short_code).first()
-    
-    if not url_entry:
-        raise HTTPException(status_code=404, detail="Short URL not found")
-    
-    
-    recent_clicks = (
-        db.query(ClickModel)
-        .filter(ClickModel.url_id == url_entry.id)
+    # LATERAL keeps the LIMIT inside the per-URL click lookup, so it walks
+    # ix_clicks_url_id_clicked_at and stops after 10 rows.
+    recent = (
+        select(
+            ClickModel.id.label("click_id"),
+            ClickModel.ip_address,
+            ClickModel.user_agent,
+            ClickModel.referer,
+            ClickModel.clicked_at
+        )
+        .where(ClickModel.url_id == URLModel.id)
         .order_by(ClickModel.clicked_at.desc())
         .limit(10)
-        .all()
+        .lateral("recent")
     )
     
-    clicks_data = [
-        ClickResponse(
-            id=click.id,
-            ip_address=click.ip_address,
-            user_agent=click.user_agent,
-            referer=click.referer,
-            clicked_at=click.clicked_at
+    rows = (
+        await db.execute(
+            select(
+                URLModel.id,
+                URLModel.original_url,
+                URLModel.short_code,
+                URLModel.created_at,
+                URLModel.expires_at,
+                URLModel.click_count,
+                URLModel.last_checked.label("last_accessed"),
+                recent.c.click_id,
+                recent.c.ip_address,
+                recent.c.user_agent,
+                recent.c.referer,
+                recent.c.clicked_at
+            )
+            .select_from(URLModel)
+            .outerjoin(recent, true())
+            .where(URLModel.short_code == short_code)
+            .order_by(recent.c.clicked_at.desc())
         )
-        for click in recent_clicks
-    ]
-    
-    return URLStats(
-        id=url_entry.id,
-        original_url=url_entry.original_url,
-        short_code=url_entry.short_code,
-        created_at=url_entry.created_at,
-        expires_at=url_entry.expires_at,
-        click_count=url_entry.click_count,
-        last_accessed=url_entry.last_checked,
-        recent_clicks=clicks_data
-    )
+    ).all()
+    
+    if not rows:
+        raise HTTPException(status_code=404, detail="Short URL not found")
+    
+    url_entry = rows[0]
+    
+    return UTCJSONResponse({
+        "id": url_entry.id,
+        "original_url": url_entry.original_url,
+        "short_code": url_entry.short_code,
+        "created_at": url_entry.created_at,
+        "expires_at": url_entry.expires_at,
+        "click_count": url_entry.click_count,
+        "last_accessed": url_entry.last_accessed,
+        "recent_clicks": [
+            {
+                "id": row.click_id,
+                "ip_address": row.ip_address,
+                "user_agent": row.user_agent,
+                "referer": row.referer,
+                "clicked_at": row.clicked_at
+            }
+            for row in rows
+            if row.click_id is not None
+        ]
+    })
 
 
 @app.get("/api/v1/urls", response_model=list[URLResponse])
 async def list_urls(
-    skip: int = 0,
+    after_id: int | None = None,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    urls = db.query(URLModel).offset(skip).limit(limit).all()
+    query = (
+        select(
+            URLModel.id,
+            URLModel.original_url,
+            URLModel.short_code,
+            URLModel.created_at,
+            URLModel.expires_at,
+            URLModel.click_count
+        )
+        .order_by(URLModel.id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        query = query.where(URLModel.id > after_id)
+    
+    rows = (await db.execute(query)).mappings().all()
     
-    url_list = []
-    for url in urls:
-        url_list.append(URLResponse(
-            id=url.id,
-            original_url=url.original_url,
-            short_code=url.short_code,
-            short_url=f"/{url.short_code}",
-            created_at=url.created_at,
-            expires_at=url.expires_at,
-            click_count=url.click_count
-        ))
+    url_list = [{**row, "short_url": f"/{row['short_code']}"} for row in rows]
+    headers = {"X-Next-After-Id": str(rows[-1]["id"])} if rows else None
     
-    return url_list
+    return UTCJSONResponse(url_list, headers=headers)
 
 
 @app.delete("/api/v1/urls/{short_code}", status_code=204)
-async def delete_url(short_code: str, db: Session = Depends(get_db)):
+async def delete_url(short_code: str, request: Request, db: AsyncSession = Depends(get_db)):
     
-    url_entry = db.query(URLModel).filter(URLModel.short_code == short_code).first()
+    url_entry = await db.scalar(select(URLModel).where(URLModel.short_code == short_code))
     
     if not url_entry:
         raise HTTPException(status_code=404, detail="Short URL not found")
     
-    db.delete(url_entry)
-    db.commit()
+    await db.delete(url_entry)
+    await db.commit()
+    await evict_url(request.app.state.redis, short_code)
     
     return Response(status_code=204)
 
@@ -0,0 +1,52 @@
+"""create urls and clicks
+
+Matches the schema that Base.metadata.create_all built before the project
+moved to Alembic, so existing databases can be stamped at this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "urls",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("original_url", sa.String(length=2048), nullable=False),
+        sa.Column("short_code", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.Column("click_count", sa.Integer(), nullable=True),
+        sa.Column("last_checked", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_urls_short_code", "urls", ["short_code"], unique=True)
+
+    op.create_table(
+        "clicks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("url_id", sa.Integer(), nullable=False),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.String(length=512), nullable=True),
+        sa.Column("referer", sa.String(length=2048), nullable=True),
+        sa.Column("clicked_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["url_id"], ["urls.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_clicks_id", "clicks", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clicks_id", table_name="clicks")
+    op.drop_table("clicks")
+    op.drop_index("ix_urls_short_code", table_name="urls")
+    op.drop_table("urls")
@@ -0,0 +1,30 @@
+"""replace the short code index with a unique covering index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_urls_short_code_cover",
+        "urls",
+        ["short_code"],
+        unique=True,
+        postgresql_include=["id", "original_url", "expires_at"]
+    )
+    op.drop_index("ix_urls_short_code", table_name="urls")
+
+
+def downgrade() -> None:
+    op.create_index("ix_urls_short_code", "urls", ["short_code"], unique=True)
+    op.drop_index("ix_urls_short_code_cover", table_name="urls")
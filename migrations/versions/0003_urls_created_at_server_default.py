@@ -0,0 +1,34 @@
+"""default urls.created_at on the server
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "urls",
+        "created_at",
+        server_default=sa.func.now(),
+        existing_type=sa.DateTime(),
+        existing_nullable=True
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "urls",
+        "created_at",
+        server_default=None,
+        existing_type=sa.DateTime(),
+        existing_nullable=True
+    )
@@ -0,0 +1,28 @@
+"""index clicks by url and recency
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_clicks_url_id_clicked_at",
+        "clicks",
+        ["url_id", sa.text("clicked_at DESC")]
+    )
+    op.drop_index("ix_clicks_id", table_name="clicks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_clicks_id", "clicks", ["id"])
+    op.drop_index("ix_clicks_url_id_clicked_at", table_name="clicks")
@@ -0,0 +1,34 @@
+"""store urls.expires_at with time zone
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "urls",
+        "expires_at",
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        postgresql_using="expires_at AT TIME ZONE 'UTC'"
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "urls",
+        "expires_at",
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        postgresql_using="expires_at AT TIME ZONE 'UTC'"
+    )
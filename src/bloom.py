@@ -0,0 +1,15 @@
+from pybloom_live import ScalableBloomFilter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.entities.url import URLModel
+
+
+# Short codes known to this process. A miss means the code is almost
+# certainly free; the unique index on urls.short_code stays authoritative,
+# since other workers insert codes this filter never sees.
+short_codes = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+
+
+async def load_short_codes(db: AsyncSession) -> None:
+    async for code in await db.stream_scalars(select(URLModel.short_code)):
+        short_codes.add(code)
\ No newline at end of file
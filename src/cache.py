@@ -0,0 +1,80 @@
+import logging
+import time
+from datetime import datetime
+from redis import RedisError, asyncio as aioredis
+from src.database.core import config
+
+
+logger = logging.getLogger(__name__)
+
+
+REDIS_URL = config.get("REDIS_URL") or "redis://localhost:6379/0"
+DEFAULT_TTL = 3600
+TOMBSTONE_TTL = 60
+
+# Returned by get_cached_url for a code deleted within the last
+# TOMBSTONE_TTL seconds.
+DELETED = object()
+
+
+def create_redis() -> aioredis.Redis:
+    return aioredis.from_url(REDIS_URL, decode_responses=True)
+
+
+def _key(short_code: str) -> str:
+    return f"short:{short_code}"
+
+
+async def get_cached_url(redis: aioredis.Redis, short_code: str) -> tuple[int, float | None, str] | object | None:
+    """Return ``(url_id, expires_ts, original_url)`` for a cached short code,
+    ``DELETED`` if it was just deleted, or ``None`` on a miss.
+
+    Redis errors are logged and treated as a miss, so callers fall back to
+    the database; the same goes for writes and evictions below.
+    """
+    try:
+        value = await redis.get(_key(short_code))
+    except RedisError:
+        logger.warning("Redis lookup failed for %s", short_code, exc_info=True)
+        return None
+    
+    if value is None:
+        return None
+    if value == "":
+        return DELETED
+    
+    url_id, expires_ts, original_url = value.split("|", 2)
+    return int(url_id), float(expires_ts) if expires_ts else None, original_url
+
+
+async def cache_url(
+    redis: aioredis.Redis,
+    short_code: str,
+    url_id: int,
+    original_url: str,
+    expires_at: datetime | None,
+    only_if_absent: bool = False
+) -> tuple[int, float | None, str]:
+    expires_ts = expires_at.timestamp() if expires_at is not None else None
+    ttl = DEFAULT_TTL if expires_ts is None else int(expires_ts - time.time())
+    if ttl > 0:
+        value = f"{url_id}|{'' if expires_ts is None else expires_ts}|{original_url}"
+        try:
+            await redis.set(_key(short_code), value, ex=ttl, nx=only_if_absent)
+        except RedisError:
+            logger.warning("Redis write failed for %s", short_code, exc_info=True)
+    
+    return url_id, expires_ts, original_url
+
+
+async def evict_url(redis: aioredis.Redis, short_code: str) -> None:
+    """Replace the entry with a short-lived tombstone.
+
+    A redirect that missed the cache before the delete committed refills it
+    with SET NX, which the tombstone blocks, so the deleted URL cannot be
+    cached again for DEFAULT_TTL.
+    """
+    try:
+        await redis.set(_key(short_code), "", ex=TOMBSTONE_TTL)
+    except RedisError:
+        logger.warning("Redis eviction failed for %s", short_code, exc_info=True)
\ No newline at end of file
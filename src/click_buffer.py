@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from src.database.core import SessionLocal
+from src.entities.click import ClickModel
+from src.entities.url import URLModel
+
+
+logger = logging.getLogger(__name__)
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    return isinstance(exc, (OperationalError, InterfaceError, OSError, asyncio.TimeoutError))
+
+
+class ClickBuffer:
+    """Collects click rows in memory and writes them in batches.
+
+    A batch is flushed once ``max_buffer`` rows are pending or
+    ``flush_interval`` seconds have passed since the first one arrived.
+    Each flush also bumps ``click_count`` and ``last_checked`` once per URL
+    in the batch, so redirects never update the URL row themselves.
+    Batches that fail for a transient reason are kept and retried, up to
+    ``max_retained`` rows.
+    """
+
+    def __init__(self, max_buffer: int = 1000, flush_interval: float = 5.0, max_retained: int = 10_000):
+        self.max_buffer = max_buffer
+        self.flush_interval = flush_interval
+        self.max_retained = max_retained
+        self._stopping = False
+        self._queue: asyncio.Queue[dict] = asyncio.Queue()
+        self._pending: list[dict] = []
+        self._task: asyncio.Task | None = None
+
+    async def put(self, row: dict) -> None:
+        await self._queue.put(row)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            # A sentinel rather than cancel(), so a batch that is mid-write
+            # is allowed to finish instead of being dropped.
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        while not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not None:
+                self._pending.append(row)
+        if self._pending and not await self._write_pending():
+            logger.error("Dropping %d buffered clicks after the final flush failed", len(self._pending))
+            self._pending = []
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            if not self._pending:
+                row = await self._queue.get()
+                if row is None:
+                    return
+                self._pending.append(row)
+            deadline = loop.time() + self.flush_interval
+            while len(self._pending) < self.max_buffer:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    return
+                self._pending.append(row)
+            if not await self._write_pending():
+                await asyncio.sleep(self.flush_interval)
+
+    async def _write_pending(self) -> bool:
+        # Rows stay in _pending until the write returns, so flush() on
+        # shutdown and the next retry still see them.
+        try:
+            await self._write(self._pending)
+        except Exception as exc:
+            if not _is_transient(exc):
+                logger.exception("Dropping %d buffered clicks", len(self._pending))
+                self._pending = []
+                return True
+            
+            logger.warning("Failed to write %d buffered clicks, will retry", len(self._pending), exc_info=True)
+            overflow = len(self._pending) - self.max_retained
+            if overflow > 0:
+                logger.error("Dropping %d oldest buffered clicks", overflow)
+                del self._pending[:overflow]
+            return False
+        
+        self._pending = []
+        return True
+
+    async def _write(self, rows: list[dict]) -> None:
+        async with SessionLocal() as db:
+            # Lock the batch's URLs first. Clicks for URLs deleted since their
+            # redirect are skipped instead of failing the whole batch on the
+            # foreign key, and the rest cannot be deleted mid-write. Locks are
+            # always taken in id order so concurrent flushes cannot deadlock.
+            url_ids = {row["url_id"] for row in rows}
+            live = set(
+                await db.scalars(
+                    select(URLModel.id)
+                    .where(URLModel.id.in_(url_ids))
+                    .order_by(URLModel.id)
+                    .with_for_update(key_share=True)
+                )
+            )
+            rows = [row for row in rows if row["url_id"] in live]
+            if not rows:
+                return
+            
+            totals: dict[int, list] = {}
+            for row in rows:
+                total = totals.setdefault(row["url_id"], [0, row["clicked_at"]])
+                total[0] += 1
+                total[1] = max(total[1], row["clicked_at"])
+            
+            await db.execute(insert(ClickModel), rows)
+            conn = await db.connection()
+            await conn.execute(
+                update(URLModel)
+                .where(URLModel.id == bindparam("b_id"))
+                .values(
+                    click_count=URLModel.click_count + bindparam("b_clicks"),
+                    last_checked=bindparam("b_last")
+                ),
+                [
+                    {"b_id": url_id, "b_clicks": clicks, "b_last": last}
+                    for url_id, (clicks, last) in sorted(totals.items())
+                ]
+            )
+            await db.commit()
+
+
+click_buffer = ClickBuffer()
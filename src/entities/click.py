@@ -1,6 +1,6 @@
 from src.database.core import Base
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
-from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
+from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 
 
@@ -10,12 +10,16 @@ from sqlalchemy.orm import relationship
 class ClickModel(Base):
     __tablename__ = "clicks"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     url_id = Column(Integer, ForeignKey("urls.id", ondelete="CASCADE"), nullable=False)
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(String(512), nullable=True)
     referer = Column(String(2048), nullable=True)
-    clicked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    clicked_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_clicks_url_id_clicked_at", url_id, clicked_at.desc()),
+    )
     
     
     url = relationship("URLModel", back_populates="clicks")
@@ -1,19 +1,26 @@
 from src.database.core import Base
-from sqlalchemy import Column, String, Integer, DateTime
-from datetime import datetime, timezone
+from sqlalchemy import Column, String, Integer, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 class URLModel(Base):
     __tablename__ = "urls"
+    __table_args__ = (
+        Index(
+            "ix_urls_short_code_cover",
+            "short_code",
+            unique=True,
+            postgresql_include=["id", "original_url", "expires_at"]
+        ),
+    )
 
     id = Column(Integer, primary_key=True, nullable=False)
     original_url = Column(String(2048), nullable=False)
-    short_code = Column(String(20), unique=True, nullable=False, index=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    expires_at = Column(DateTime, nullable=True)
+    short_code = Column(String(20), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=True)
     click_count = Column(Integer, default=0)
-    last_checked = Column(DateTime, nullable=True)
+    last_checked = Column(DateTime(timezone=True), nullable=True)
     
     
-    clicks = relationship("ClickModel", back_populates="url", cascade="all, delete-orphan")
+    clicks = relationship("ClickModel", back_populates="url", cascade="all, delete-orphan", passive_deletes=True)
     
@@ -0,0 +1,17 @@
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class UTCJSONResponse(ORJSONResponse):
+    """ORJSONResponse that writes UTC datetimes with a ``Z`` suffix.
+
+    Matches how pydantic serializes ``response_model`` bodies, so endpoints
+    that bypass pydantic keep the same timestamp format on the wire.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
\ No newline at end of file
@@ -23,6 +23,16 @@ class URLCreate(BaseModel):
         description="Optional expiration date for the short URL"
     )
     
+    @field_validator('original_url')
+    @classmethod
+    def validate_original_url(cls, v):
+        
+        # original_url is stored in the short_code covering index, whose
+        # btree entries are limited to roughly 2.7 KB.
+        if len(v.encode('utf-8')) > 2048:
+            raise ValueError('URL must be at most 2048 bytes when UTF-8 encoded')
+        return v
+    
     @field_validator('custom_alias')
     @classmethod
     def validate_custom_alias(cls, v):
@@ -35,6 +45,14 @@ class URLCreate(BaseModel):
                 )
         return v
     
+    @field_validator('expires_at')
+    @classmethod
+    def validate_expires_at(cls, v):
+        
+        if v is not None and v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+        return v
+    
    
 class URLResponse(BaseModel):
    
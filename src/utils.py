@@ -1,32 +1,31 @@
+import os
 import string
-import random
 import re
-from urllib.parse import urlparse
+
+
+_ALPHABET = (string.ascii_letters + string.digits).encode()
+# Byte -> alphabet lookup for bytes.translate; bytes >= 248 are dropped so
+# every character is equally likely (248 = 4 * 62).
+_BASE62 = bytes(_ALPHABET[i % 62] for i in range(256))
+_UNUSED_BYTES = bytes(range(248, 256))
+
+_URL_PATTERN = re.compile(
+    r'^https?://'  
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|' 
+    r'localhost|' 
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})' 
+    r'(?::\d+)?'  
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
 
 
 def generate_short_code(length: int = 6) -> str:
    
-    characters = string.ascii_letters + string.digits
-    return ''.join(random.choices(characters, k=length))
+    code = b''
+    while len(code) < length:
+        code += os.urandom(length * 2).translate(_BASE62, _UNUSED_BYTES)
+    return code[:length].decode()
 
 
 def is_valid_url(url: str) -> bool:
     
-    
-    url_pattern = re.compile(
-        r'^https?://'  
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|' 
-        r'localhost|' 
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})' 
-        r'(?::\d+)?'  
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    
-    if not url_pattern.match(url):
-        return False
-    
-    
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except Exception:
-        return False
\ No newline at end of file
+    return _URL_PATTERN.match(url) is not None
\ No newline at end of file